@@ -11,12 +11,54 @@ a CSV file where:
 
 import os
 import re
+import sys
 import csv
+import json
 import argparse
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import chain
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 
 
+# Precompiled pattern (avoid per-call regex cache lookups).
+# Operates on raw bytes so only matched fields need to be decoded.
+# The common "<number><unit>" mean is split by the regex itself (groups 2 and 3);
+# anything else falls through to group 4 and goes via parse_time_value.
+# Applied with finditer to whole files, so it is multiline-anchored and no part of
+# it may match across a line break.
+_LINE_RE = re.compile(rb'^\[[ \t]+OK[ \t]+\][ \t]+([^(\r\n]+)[ \t]+\(mean[ \t]+'
+                      rb'(?:(\d+(?:\.\d*)?|\.\d+)(us|ms|s)|([^,\r\n]+)),', re.MULTILINE)
+
+# Scale to microseconds for each unit captured by _LINE_RE
+_UNIT_SCALE = {b'us': 1.0, b'ms': 1000.0, b's': 1000000.0}
+
+# Total size of the input files above which they are parsed in a process pool
+_PARALLEL_MIN_BYTES = 64 * 1024 * 1024
+
+# Suffix of the optional parse cache written next to each result file
+_CACHE_SUFFIX = '.cache.json'
+
+# Parser version stored in the cache key. Bump it whenever _LINE_RE, _UNIT_SCALE,
+# parse_time_value or the cache layout change, so stale caches are re-parsed
+_CACHE_VERSION = 1
+
+# Test name variant suffixes and their slot in a (std_vector, chunked_vector) pivot cell
+_VARIANT_SLOTS = {'std_vector': 0, 'chunked_vector': 1}
+
+# Characters that require a CSV field to be quoted
+_CSV_SPECIAL_RE = re.compile(r'[",\r\n]')
+
+# CSV cell values for a (test, platform) pair with no results
+_EMPTY_CELL = ("", "", "")
+
+# Time unit suffixes and their scale to microseconds.
+# Order matters: 'us' and 'ms' must be tested before 's'.
+_TIME_UNITS = (('us', 1.0), ('ms', 1000.0), ('s', 1000000.0))
+
+
 def parse_time_value(time_str: str) -> float:
     """
     Parse time string and convert to microseconds for consistent comparison.
@@ -30,52 +72,84 @@ def parse_time_value(time_str: str) -> float:
     # Remove any whitespace
     time_str = time_str.strip()
     
-    # Extract numeric value and unit
-    match = re.match(r'([0-9.]+)(us|ms|s)', time_str)
-    if not match:
-        raise ValueError(f"Could not parse time value: {time_str}")
-    
-    value = float(match.group(1))
-    unit = match.group(2)
-    
-    # Convert to microseconds
-    if unit == 'us':
-        return value
-    elif unit == 'ms':
-        return value * 1000
-    elif unit == 's':
-        return value * 1000000
-    else:
-        raise ValueError(f"Unknown time unit: {unit}")
+    # Split off the unit suffix and scale the numeric prefix. The prefix must be plain
+    # ASCII digits and dots: float() alone would also accept signs, exponents,
+    # underscores, whitespace, "nan" and "inf"
+    for suffix, scale in _TIME_UNITS:
+        if time_str.endswith(suffix):
+            value = time_str[:-len(suffix)]
+            if value.isascii() and value.replace('.', '').isdigit():
+                try:
+                    return float(value) * scale
+                except ValueError:
+                    pass
+            break
+    
+    raise ValueError(f"Could not parse time value: {time_str}")
 
 
-def parse_performance_file(file_path: str) -> Dict[str, float]:
+def parse_performance_file(file_path: str, use_cache: bool = False) -> Dict[str, float]:
     """
     Parse a single performance result file.
     
     Args:
         file_path: Path to the performance result file
+        use_cache: Reuse (and store) parsed results in "<file_path>.cache.json",
+                   keyed by the parser version and the file's modification time and size
     
     Returns:
         Dictionary mapping test names to execution times (in microseconds)
     """
+    if use_cache:
+        # The cache file sits next to its input, so the path is not part of the key
+        # (it would differ depending on how the input directory was spelled)
+        stat = os.stat(file_path)
+        cache_path = file_path + _CACHE_SUFFIX
+        cache_key = [_CACHE_VERSION, stat.st_mtime_ns, stat.st_size]
+        
+        # JSON rather than pickle: input directories are filled with downloaded CI
+        # artifacts, so loading a cache must never be able to execute code
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as cache_file:
+                cache = json.load(cache_file)
+            if cache['key'] == cache_key:
+                for warning in cache['warnings']:
+                    print(warning)
+                return cache['results']
+        except (OSError, ValueError, LookupError, TypeError):
+            # Missing, stale format or corrupt cache: fall back to parsing
+            pass
+    
     results = {}
+    parse_warnings = []
+    # Read the whole file in binary mode (no per-line decoding)
+    with open(file_path, 'rb') as file:
+        data = file.read()
+    
+    # Scan for result lines with format: [       OK ] test_name (mean X.XXXus, ...)
+    for match in _LINE_RE.finditer(data):
+        test_name = match.group(1).strip().decode('utf-8', 'replace')
+        value, unit, time_str = match.group(2, 3, 4)
+        
+        try:
+            if unit:
+                time_value = float(value) * _UNIT_SCALE[unit]
+            else:
+                time_value = parse_time_value(time_str.decode('utf-8', 'replace'))
+            results[test_name] = time_value
+        except ValueError as e:
+            parse_warnings.append(f"Warning: Could not parse time for {test_name}: {e}")
     
-    with open(file_path, 'r') as file:
-        for line in file:
-            line = line.strip()
-            
-            # Look for result lines with format: [       OK ] test_name (mean X.XXXus, ...)
-            match = re.match(r'\[\s+OK\s+\]\s+([^(]+)\s+\(mean\s+([^,]+),', line)
-            if match:
-                test_name = match.group(1).strip()
-                time_str = match.group(2).strip()
-                
-                try:
-                    time_value = parse_time_value(time_str)
-                    results[test_name] = time_value
-                except ValueError as e:
-                    print(f"Warning: Could not parse time for {test_name}: {e}")
+    for warning in parse_warnings:
+        print(warning)
+    
+    if use_cache:
+        # Warnings are cached too, so they are reported again on cache hits
+        try:
+            with open(cache_path, 'w', encoding='utf-8') as cache_file:
+                json.dump({'key': cache_key, 'warnings': parse_warnings, 'results': results}, cache_file)
+        except OSError as e:
+            print(f"Warning: Could not write cache {cache_path}: {e}")
     
     return results
 
@@ -99,60 +173,30 @@ def extract_platform_name(filename: str) -> str:
     return filename
 
 
-def get_base_test_name(test_name: str) -> str:
-    """
-    Extract base test name without .std_vector or .chunked_vector suffix.
-    
-    Args:
-        test_name: Full test name like "push_back_small.std_vector"
-    
-    Returns:
-        Base test name like "push_back_small"
-    """
-    if test_name.endswith('.std_vector'):
-        return test_name[:-len('.std_vector')]
-    elif test_name.endswith('.chunked_vector'):
-        return test_name[:-len('.chunked_vector')]
-    else:
-        return test_name
-
-
-def calculate_ratio(std_vector_time: float, chunked_vector_time: float) -> float:
-    """
-    Calculate ratio of std_vector time to chunked_vector time.
-    
-    Args:
-        std_vector_time: Baseline time (std_vector)
-        chunked_vector_time: Comparison time (chunked_vector)
-    
-    Returns:
-        Ratio (std_vector_time / chunked_vector_time)
-        Values > 1 mean chunked_vector is faster
-        Values < 1 mean std_vector is faster
-    """
-    if chunked_vector_time == 0:
-        return float('inf') if std_vector_time > 0 else 0.0
-    
-    return std_vector_time / chunked_vector_time
-
-
 def main():
     parser = argparse.ArgumentParser(description='Parse performance test results and generate CSV')
     parser.add_argument('--input-dir', '-i', default='.', 
                        help='Directory containing performance result files (default: current directory)')
     parser.add_argument('--output', '-o', default='performance_comparison.csv',
                        help='Output CSV file (default: performance_comparison.csv)')
+    parser.add_argument('--verbose', '-v', action='store_true',
+                       help='Print progress for each file as it is processed')
+    parser.add_argument('--cache', action='store_true',
+                       help='Cache parsed results next to each input file and reuse them while the file is unchanged')
     
     args = parser.parse_args()
     
     input_dir = Path(args.input_dir)
     
-    if not input_dir.exists():
+    if not input_dir.is_dir():
         print(f"Error: Directory {input_dir} does not exist")
         return 1
     
-    # Find all performance result files
-    result_files = list(input_dir.glob("performance_results_*.txt"))
+    # Find all performance result files (single directory pass, no per-entry Path objects)
+    with os.scandir(input_dir) as entries:
+        result_files = [entry.path for entry in entries
+                        if entry.name.startswith("performance_results_")
+                        and entry.name.endswith(".txt") and entry.is_file()]
     
     if not result_files:
         print(f"Error: No performance result files found in {input_dir}")
@@ -161,40 +205,99 @@ def main():
     print(f"Found {len(result_files)} performance result files")
     
     # Parse all files
-    all_platforms_data = {}
-    all_test_names = set()
+    platform_names = []
+    file_summary = []
+    all_base_tests = {}
+    
+    # Pivot table filled as each file's results arrive, keyed by (base test, platform):
+    # slot 0 holds the std_vector time, slot 1 the chunked_vector time
+    cells = defaultdict(lambda: [None, None])
+    
+    # Files are independent, so large inputs are parsed concurrently in worker processes.
+    # Small inputs (the usual CI case) are parsed in-process inside the loop below, since
+    # starting the pool costs more than the parsing itself
+    cpu_count = os.cpu_count() or 1
+    use_pool = (len(result_files) > 1 and cpu_count > 1 and
+                sum(os.path.getsize(file_path) for file_path in result_files) >= _PARALLEL_MIN_BYTES)
+    
+    if use_pool:
+        with ProcessPoolExecutor(max_workers=min(len(result_files), cpu_count)) as executor:
+            futures = [executor.submit(parse_performance_file, file_path, args.cache) for file_path in result_files]
+        parsers = [future.result for future in futures]
+    else:
+        parsers = [partial(parse_performance_file, file_path, args.cache) for file_path in result_files]
     
-    for file_path in result_files:
-        platform_name = extract_platform_name(file_path.name)
-        print(f"Processing {platform_name}...")
+    for file_path, parse in zip(result_files, parsers):
+        platform_name = extract_platform_name(os.path.basename(file_path))
+        if args.verbose:
+            print(f"Processing {platform_name}...")
         
         try:
-            results = parse_performance_file(str(file_path))
-            all_platforms_data[platform_name] = results
+            results = parse()
+            platform_names.append(platform_name)
             
-            # Track all test names for consistent columns
-            all_test_names.update(results.keys())
+            # Track all base test names for consistent rows; a name without a
+            # .std_vector/.chunked_vector suffix is its own base test (with empty cells).
+            # Base names are interned here, so the row keys and every platform's pivot
+            # keys share one string object per test
+            for test_name, time_value in results.items():
+                base_test, sep, variant = test_name.rpartition('.')
+                slot = _VARIANT_SLOTS.get(variant)
+                if sep and slot is not None:
+                    base_test = sys.intern(base_test)
+                    all_base_tests[base_test] = None
+                    cells[(base_test, platform_name)][slot] = time_value
+                else:
+                    all_base_tests[sys.intern(test_name)] = None
             
-            print(f"  Found {len(results)} test results")
+            file_summary.append((platform_name, len(results)))
+            if args.verbose:
+                print(f"  Found {len(results)} test results")
             
         except Exception as e:
             print(f"Error processing {file_path}: {e}")
             continue
     
-    # Extract unique base test names
-    base_test_names = set()
-    for test_name in all_test_names:
-        base_test_names.add(get_base_test_name(test_name))
+    # Per-file results as a single table (one write instead of two lines per file)
+    if file_summary and not args.verbose:
+        name_width = max(len(name) for name, _ in file_summary)
+        sys.stdout.write("".join(f"  {name:<{name_width}}  {count} test results\n"
+                                 for name, count in file_summary))
     
-    base_test_names = sorted(base_test_names)
+    base_test_names = sorted(all_base_tests)
     
     print(f"Found {len(base_test_names)} unique base tests")
     
+    # Format every cell exactly once: (std_vector, chunked_vector, ratio) strings
+    formatted_cells = {}
+    for key, (std_vector_time, chunked_vector_time) in cells.items():
+        try:
+            # Both variants present (the common case): no explicit None checks.
+            # Ratio > 1 means chunked_vector is faster, < 1 means std_vector is faster
+            formatted_cells[key] = (
+                f"{std_vector_time:.3f}",
+                f"{chunked_vector_time:.3f}",
+                f"{std_vector_time / chunked_vector_time:.2f}"
+            )
+        except ZeroDivisionError:
+            formatted_cells[key] = (
+                f"{std_vector_time:.3f}",
+                f"{chunked_vector_time:.3f}",
+                "inf" if std_vector_time > 0 else "0.00"
+            )
+        except TypeError:
+            # One of the variants is missing (None) on this platform
+            formatted_cells[key] = (
+                f"{std_vector_time:.3f}" if std_vector_time is not None else "",
+                f"{chunked_vector_time:.3f}" if chunked_vector_time is not None else "",
+                ""
+            )
+    
     # Prepare CSV columns - transposed format (tests as rows, platforms as columns)
     csv_columns = ['Test']
     
     # Add columns for each platform
-    sorted_platforms = sorted(all_platforms_data.keys())
+    sorted_platforms = sorted(platform_names)
     for platform_name in sorted_platforms:
         csv_columns.extend([
             f"{platform_name}.std_vector (us)",
@@ -202,47 +305,36 @@ def main():
             f"{platform_name}.ratio"
         ])
     
-    # Generate CSV data - transposed format
-    csv_data = []
-    
-    for base_test in base_test_names:
-        row = [base_test]
-        
-        for platform_name in sorted_platforms:
-            platform_data = all_platforms_data[platform_name]
-            
-            std_vector_name = f"{base_test}.std_vector"
-            chunked_vector_name = f"{base_test}.chunked_vector"
-            
-            std_vector_time = platform_data.get(std_vector_name, None)
-            chunked_vector_time = platform_data.get(chunked_vector_name, None)
-            
-            # Add std_vector time
-            row.append(f"{std_vector_time:.3f}" if std_vector_time is not None else "")
-            
-            # Add chunked_vector time
-            row.append(f"{chunked_vector_time:.3f}" if chunked_vector_time is not None else "")
-            
-            # Calculate and add ratio
-            if std_vector_time is not None and chunked_vector_time is not None:
-                ratio = calculate_ratio(std_vector_time, chunked_vector_time)
-                row.append(f"{ratio:.2f}")
-            else:
-                row.append("")
-        
-        csv_data.append(row)
-    
-    # Write CSV file
+    # Write CSV file, streaming rows as they are generated (transposed format)
     output_path = Path(args.output)
+    get_cell = formatted_cells.get
     
     try:
         with open(output_path, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.writer(csvfile)
-            writer.writerow(csv_columns)
-            writer.writerows(csv_data)
+            # Formatted numbers never need quoting and names normally don't, so rows are
+            # joined directly; csv.writer is only used if some name needs escaping
+            if any(_CSV_SPECIAL_RE.search(name) for name in chain(csv_columns, base_test_names)):
+                write_row = csv.writer(csvfile).writerow
+            else:
+                write = csvfile.write
+                
+                def write_row(row):
+                    write(','.join(row) + '\r\n')
+            
+            write_row(csv_columns)
+            
+            for base_test in base_test_names:
+                row = [base_test]
+                extend_row = row.extend
+                
+                for platform_name in sorted_platforms:
+                    # Add std_vector time, chunked_vector time and ratio
+                    extend_row(get_cell((base_test, platform_name), _EMPTY_CELL))
+                
+                write_row(row)
         
         print(f"Successfully generated {output_path}")
-        print(f"CSV contains {len(csv_data)} tests and {len(sorted_platforms)} platforms")
+        print(f"CSV contains {len(base_test_names)} tests and {len(sorted_platforms)} platforms")
         
     except Exception as e:
         print(f"Error writing CSV file: {e}")